@@ -7,4 +7,16 @@ UPLOAD_TO_TELEGRAM = True
 TIMEZONE = "Asia/Tomsk"
 
 # --- ИСТОЧНИК ДАМПОВ ---
-SOURCE_REPO = "https://github.com/niklinque/wplace-tomsk"
\ No newline at end of file
+SOURCE_REPO = "https://github.com/niklinque/wplace-tomsk"
+
+# --- МАСШТАБИРОВАНИЕ ---
+# auto, cv2, vips или cykooz
+RESIZE_BACKEND = "auto"
+
+# --- КОДИРОВАНИЕ ВИДЕО ---
+FFMPEG_PRESET = "veryfast"
+FFMPEG_NVENC_PRESET = "p4"
+FFMPEG_CRF = 23
+# Кодирование через cv2.cudacodec (нужна сборка OpenCV с CUDA). Без +faststart:
+# индекс MP4 пишется в конец файла
+USE_CUDACODEC = False
@@ -1,22 +1,57 @@
 import os
-import glob
 import logging
+import re
+import shutil
+import struct
+import subprocess
 import sys
 import argparse
+import hashlib
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from math import gcd
 from zoneinfo import ZoneInfo
-from PIL import Image, ImageDraw
 import cv2
 import numpy as np
 from config import *
 
+try:
+    import pyvips
+except ImportError:
+    pyvips = None
+
+try:
+    import cykooz_resizer
+except ImportError:
+    try:
+        # До версии 4 пакет импортировался как cykooz.resizer
+        import cykooz.resizer as cykooz_resizer
+    except ImportError:
+        cykooz_resizer = None
+
 # Настройка логирования
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# pyvips пишет в logging подробности каждой операции на уровне INFO
+logging.getLogger('pyvips').setLevel(logging.WARNING)
 
 # Константы
 OUTPUT_DIR = "output"
 TIMELAPSE_DIR = "timelapse"
+FRAME_WORKERS = min(8, os.cpu_count() or 1)
+STRIP_ROWS = 512
+FRAME_CACHE_VERSION = 1
+RESIZE_BACKENDS = ('auto', 'cv2', 'vips', 'cykooz')
+TIMESTAMP_FONT = cv2.FONT_HERSHEY_SIMPLEX
+TIMESTAMP_THICKNESS = 2
+TIMESTAMP_STROKE_THICKNESS = 6
+TIMESTAMP_FONT_SIZE = 36
+TIMESTAMP_TEMPLATE = "0000-00-00 00:00:00"
+FrameLayout = namedtuple('FrameLayout', ['source_size', 'resized_size', 'crop', 'placement', 'interpolation'])
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+MERGED_TILES_PATTERN = re.compile(r'merged_tiles_(\d{8})_(\d{6})\.png$')
 
 try:
     SCRIPT_TZ = ZoneInfo(TIMEZONE)
@@ -37,30 +72,27 @@ def get_images_for_date(date_str):
     images = []
     
     date_folder = os.path.join(OUTPUT_DIR, date_str)
-    if os.path.exists(date_folder):
-        pattern = os.path.join(date_folder, "merged_tiles_*.png")
-        folder_images = glob.glob(pattern)
-        images.extend(folder_images)
-        logger.info(f"В папке {date_str} найдено {len(folder_images)} изображений")
-    
-    # Сортируем по дате и времени из имени файла: merged_tiles_YYYYMMDD_HHMMSS.png
-    def extract_timestamp_key(file_path):
-        filename = os.path.basename(file_path)
-        parts = filename.split('_')
-        if len(parts) >= 4:
-            date_part = parts[2]
-            time_part = parts[3].split('.')[0]
-            return f"{date_part}_{time_part}"
-        return filename
-    
-    images.sort(key=extract_timestamp_key)
-
+    if os.path.isdir(date_folder):
+        # Имя файла: merged_tiles_YYYYMMDD_HHMMSS.png — ключ сортировки берем прямо из него
+        with os.scandir(date_folder) as entries:
+            keyed = [
+                (int(match.group(1) + match.group(2)), entry.path)
+                for entry in entries
+                if (match := MERGED_TILES_PATTERN.match(entry.name))
+            ]
+        keyed.sort()
+        images = [path for _, path in keyed]
+        logger.info(f"В папке {date_str} найдено {len(images)} изображений")
+    
     if not images:
         return [], 0, 0
 
-    # Получение размера выпускного видео из последнего дампа
-    image_size = Image.open(images[-1])
-    video_width, video_height = image_size.size
+    # Получение размера выпускного видео из последнего дампа (по заголовку, без декодирования)
+    header = read_png_header(images[-1])
+    if header is not None:
+        video_width, video_height = header[:2]
+    else:
+        video_height, video_width = cv2.imread(images[-1], cv2.IMREAD_UNCHANGED).shape[:2]
 
     if SCALE != 1:
         video_width = int(video_width * SCALE)
@@ -69,94 +101,896 @@ def get_images_for_date(date_str):
     logger.info(f"Всего найдено {len(images)} изображений за {date_str}")
     return images, video_width, video_height
 
-def resize_image_to_fit(image, scale, width, height, background_color):
+def read_png_header(image_path):
+    """
+    Читает размеры PNG и наличие альфа-канала из заголовка IHDR, не декодируя картинку.
+    
+    Args:
+        image_path (str): Путь к файлу изображения
+        
+    Returns:
+        tuple: (width, height, has_alpha) или None, если это не PNG
+    """
+    with open(image_path, 'rb') as f:
+        header = f.read(26)
+    if len(header) < 26 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        return None
+    
+    width, height = struct.unpack('>II', header[16:24])
+    # Тип цвета: 4 — серый с альфой, 6 — RGBA, 3 — палитра (может содержать прозрачность)
+    has_alpha = header[25] in (3, 4, 6)
+    return width, height, has_alpha
+
+def read_frame(image_path):
+    """
+    Загружает изображение сразу в массив NumPy в формате BGR/BGRA.
+    
+    Дампы без прозрачности читаются с IMREAD_COLOR: OpenCV сразу отдает
+    непрерывный 8-битный BGR без последующих преобразований и копий.
+    
+    Args:
+        image_path (str): Путь к файлу изображения
+        
+    Returns:
+        np.ndarray: Изображение (uint8, 3 или 4 канала) или None, если файл не удалось прочитать
+    """
+    header = read_png_header(image_path)
+    if header is not None and not header[2]:
+        return cv2.imread(image_path, cv2.IMREAD_COLOR)
+    
+    image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        return None
+    
+    if image.dtype != np.uint8:
+        image = cv2.convertScaleAbs(image, alpha=255.0 / 65535.0)
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    return image
+
+def read_frame_vips(image_path, size, interpolation):
+    """
+    Декодирует и сразу масштабирует изображение через libvips.
+    
+    С access='sequential' libvips читает PNG потоком и уменьшает его по ходу
+    декодирования, поэтому полный исходный кадр в памяти не появляется.
+    
+    Args:
+        image_path (str): Путь к файлу изображения
+        size (tuple): Итоговый размер (width, height)
+        interpolation (int): Метод интерполяции OpenCV, определяет ядро libvips
+        
+    Returns:
+        np.ndarray: Изображение BGR или BGRA (uint8)
+    """
+    image = pyvips.Image.new_from_file(image_path, access='sequential')
+    if image.interpretation != 'srgb':
+        image = image.colourspace('srgb')
+    
+    kernel = 'nearest' if interpolation == cv2.INTER_NEAREST else 'lanczos3'
+    image = image.resize(size[0] / image.width, vscale=size[1] / image.height, kernel=kernel)
+    if image.format != 'uchar':
+        image = image.cast('uchar')
+    
+    array = np.ndarray(
+        buffer=image.write_to_memory(), dtype=np.uint8, shape=[image.height, image.width, image.bands]
+    )
+    return cv2.cvtColor(array, cv2.COLOR_RGBA2BGRA if image.bands == 4 else cv2.COLOR_RGB2BGR)
+
+def resize_cykooz(image, size, interpolation):
+    """
+    Масштабирует изображение через cykooz.resizer (SIMD-свертка на Rust).
+    
+    Args:
+        image (np.ndarray): Изображение BGR или BGRA (uint8)
+        size (tuple): Итоговый размер (width, height)
+        interpolation (int): Метод интерполяции OpenCV, определяет фильтр cykooz
+        
+    Returns:
+        np.ndarray: Масштабированное изображение с тем же числом каналов
+    """
+    if interpolation == cv2.INTER_NEAREST:
+        algorithm = cykooz_resizer.ResizeAlg.nearest()
+    elif interpolation == cv2.INTER_AREA:
+        algorithm = cykooz_resizer.ResizeAlg.convolution(cykooz_resizer.FilterType.box)
+    else:
+        algorithm = cykooz_resizer.ResizeAlg.convolution(cykooz_resizer.FilterType.lanczos3)
+    
+    img_height, img_width, channels = image.shape
+    pixel_type = cykooz_resizer.PixelType.U8x4 if channels == 4 else cykooz_resizer.PixelType.U8x3
+    # ImageData принимает только bytes, поэтому копии исходного кадра не избежать
+    src = cykooz_resizer.ImageData(img_width, img_height, pixel_type, image.tobytes())
+    dst = cykooz_resizer.ImageData(size[0], size[1], pixel_type)
+    cykooz_resizer.Resizer().resize(src, dst, cykooz_resizer.ResizeOptions(resize_alg=algorithm))
+    # get_buffer отдает неизменяемые bytes, а в кадр потом пишется метка
+    return np.frombuffer(bytearray(dst.get_buffer()), dtype=np.uint8).reshape(size[1], size[0], channels)
+
+def resolve_resize_backend(name):
+    """
+    Выбирает библиотеку для масштабирования кадров.
+    
+    Args:
+        name (str): Одно из RESIZE_BACKENDS; 'auto' выбирает libvips, затем cykooz, затем OpenCV
+        
+    Returns:
+        str: 'cv2', 'vips' или 'cykooz'
+        
+    Raises:
+        ValueError: Если запрошенная библиотека не установлена
+    """
+    available = {'cv2': True, 'vips': pyvips is not None, 'cykooz': cykooz_resizer is not None}
+    if name == 'auto':
+        return next(backend for backend in ('vips', 'cykooz', 'cv2') if available[backend])
+    if name not in available:
+        raise ValueError(f"Неизвестный способ масштабирования: {name}")
+    if not available[name]:
+        raise ValueError(f"Для масштабирования через {name} нужно установить соответствующий пакет")
+    return name
+
+def read_frame_scaled(image_path, video_width, video_height, resize_backend='cv2'):
+    """
+    Загружает изображение, по возможности сразу в итоговом размере.
+    
+    С resize_backend='vips' декодирование и ресайз выполняются вместе в libvips,
+    с 'cykooz' кадр декодируется через cv2.imread и масштабируется cykooz.resizer;
+    с 'cv2' масштаб применяет resize_image_to_fit.
+    
+    Args:
+        image_path (str): Путь к файлу изображения
+        video_width (int): Ширина видео
+        video_height (int): Высота видео
+        resize_backend (str): 'cv2', 'vips' или 'cykooz' (см. resolve_resize_backend)
+        
+    Returns:
+        tuple: (np.ndarray или None, коэффициент масштабирования, который еще нужно применить)
+    """
+    if resize_backend == 'vips':
+        header = read_png_header(image_path)
+        if header is not None:
+            img_width, img_height = header[:2]
+            layout = compute_frame_layout(img_width, img_height, SCALE, video_width, video_height)
+            if layout.resized_size != layout.source_size:
+                try:
+                    return read_frame_vips(image_path, layout.resized_size, layout.interpolation), 1
+                except pyvips.Error as e:
+                    logger.warning(f"libvips не смог прочитать {image_path}, используется OpenCV: {e}")
+    
+    image = read_frame(image_path)
+    if resize_backend == 'cykooz' and image is not None:
+        layout = compute_frame_layout(image.shape[1], image.shape[0], SCALE, video_width, video_height)
+        if layout.resized_size != layout.source_size:
+            return resize_cykooz(image, layout.resized_size, layout.interpolation), 1
+    
+    return image, SCALE
+
+def blend_over_background(image, background_color, out):
+    """
+    Накладывает изображение BGRA на сплошной фон: out = bgr * a + фон * (1 - a).
+    
+    Считается целочисленными операциями OpenCV над uint8, без промежуточных
+    массивов float32 размером с кадр.
+    
+    Args:
+        image (np.ndarray): Изображение в формате BGRA
+        background_color (tuple): Цвет фона в формате BGR
+        out (np.ndarray): Область кадра BGR того же размера, куда пишется результат
+    """
+    alpha = cv2.merge([image[:, :, 3]] * 3)
+    foreground = cv2.multiply(image[:, :, :3], alpha, scale=1 / 255)
+    background = cv2.multiply(cv2.bitwise_not(alpha), (*background_color, 0), scale=1 / 255)
+    cv2.add(foreground, background, dst=out)
+
+def has_binary_alpha(image):
+    """
+    Проверяет, что альфа-канал содержит только 0 и 255.
+    
+    Пиксели wplace либо полностью прозрачны, либо закрашены целиком, так что
+    для дампов это обычный случай, и смешивание можно заменить копированием по маске.
+    
+    Args:
+        image (np.ndarray): Изображение в формате BGRA
+        
+    Returns:
+        bool: True, если полупрозрачных пикселей нет
+    """
+    alpha = cv2.extractChannel(image, 3)
+    return cv2.countNonZero(cv2.inRange(alpha, 1, 254)) == 0
+
+def paste_opaque_pixels(image, out):
+    """
+    Копирует непрозрачные пиксели изображения BGRA в кадр, уже залитый фоном.
+    
+    Args:
+        image (np.ndarray): Изображение в формате BGRA с альфой только 0 или 255
+        out (np.ndarray): Область кадра BGR того же размера, куда пишется результат
+    """
+    cv2.copyTo(cv2.cvtColor(image, cv2.COLOR_BGRA2BGR), cv2.extractChannel(image, 3), out)
+
+def fill_background(region, background_color):
+    """
+    Заливает область кадра цветом фона.
+    
+    cv2.rectangle заметно быстрее присваивания кортежа срезу NumPy, которое
+    идет поэлементным broadcast по трем каналам.
+    
+    Args:
+        region (np.ndarray): Область кадра BGR (может быть пустой)
+        background_color (tuple): Цвет фона в формате BGR
+    """
+    region_height, region_width = region.shape[:2]
+    if region_height and region_width:
+        cv2.rectangle(region, (0, 0), (region_width - 1, region_height - 1), background_color, cv2.FILLED)
+
+def resize_in_strips(image, new_width, new_height, interpolation, strip_rows=STRIP_ROWS):
+    """
+    Изменяет размер изображения горизонтальными полосами.
+    
+    Границы полос выбираются так, чтобы на входе и на выходе они попадали
+    на целые строки, поэтому для INTER_AREA/INTER_NEAREST результат
+    совпадает с ресайзом целого кадра, а промежуточные буферы имеют размер
+    полосы, а не кадра, и остаются в кэше процессора. Плавное увеличение
+    делается одним вызовом, так как там соседние полосы влияют друг на друга.
+    
+    Args:
+        image (np.ndarray): Исходное изображение
+        new_width (int): Новая ширина
+        new_height (int): Новая высота
+        interpolation (int): Метод интерполяции OpenCV
+        strip_rows (int): Примерная высота входной полосы в строках
+        
+    Yields:
+        tuple: (y, полоса) — смещение полосы в результате и сама полоса
+    """
+    img_height, img_width = image.shape[:2]
+    
+    if (new_width, new_height) == (img_width, img_height):
+        for y in range(0, img_height, strip_rows):
+            yield y, image[y:y + strip_rows]
+        return
+    
+    # При увеличении интерполяция берет соседей через границу полосы
+    if new_height > img_height and interpolation != cv2.INTER_NEAREST:
+        yield 0, cv2.resize(image, (new_width, new_height), interpolation=interpolation)
+        return
+    
+    # Наименьшая пара шагов, у которой обе границы целые
+    common = gcd(img_height, new_height)
+    in_step = img_height // common
+    out_step = new_height // common
+    repeat = max(1, strip_rows // in_step)
+    in_step *= repeat
+    out_step *= repeat
+    
+    for out_y in range(0, new_height, out_step):
+        in_y = out_y * img_height // new_height
+        strip_height = min(out_step, new_height - out_y)
+        strip = image[in_y:in_y + in_step]
+        yield out_y, cv2.resize(strip, (new_width, strip_height), interpolation=interpolation)
+
+@lru_cache(maxsize=8)
+def compute_frame_layout(img_width, img_height, scale, width, height):
+    """
+    Вычисляет геометрию вписывания кадра в видео.
+    
+    Все дампы за день одного размера, поэтому результат кэшируется и
+    считается один раз на все кадры.
+    
+    Args:
+        img_width (int): Ширина исходного изображения
+        img_height (int): Высота исходного изображения
+        scale (int): Коэффициент масштабирования
+        width (int): Ширина получаемого видео
+        height (int): Высота получаемого видео
+        
+    Returns:
+        FrameLayout: Размеры, обрезка, позиция на холсте и метод ресайза
+    """
+    new_width = int(img_width * scale)
+    new_height = int(img_height * scale)
+    
+    # Выбираем метод ресайза: для кратного масштабирования используем NEAREST (пиксель-перфект),
+    # для уменьшения — усреднение по площади, для увеличения — LANCZOS
+    down_int = (img_width % width == 0) and (img_height % height == 0)
+    up_int = (width % img_width == 0) and (height % img_height == 0)
+    if down_int or up_int:
+        interpolation = cv2.INTER_NEAREST
+    elif scale < 1:
+        interpolation = cv2.INTER_AREA
+    else:
+        interpolation = cv2.INTER_LANCZOS4
+    
+    # Если кадр больше видео, он обрезается по центру
+    crop = None
+    fit_width, fit_height = new_width, new_height
+    if new_width > width or new_height > height:
+        crop = (max(new_width - width, 0) // 2, max(new_height - height, 0) // 2)
+        fit_width = min(new_width, width)
+        fit_height = min(new_height, height)
+    
+    # Вычисляем позицию для центрирования
+    x = (width - fit_width) // 2
+    y = (height - fit_height) // 2
+    
+    return FrameLayout(
+        source_size=(img_width, img_height),
+        resized_size=(new_width, new_height),
+        crop=crop,
+        placement=(x, y, fit_width, fit_height),
+        interpolation=interpolation,
+    )
+
+def resize_image_to_fit(image, scale, width, height, background_color, canvas=None):
     """
     Изменяет размер изображения с сохранением пропорций и добавляет фон.
     
+    Если передан canvas, кадр собирается в нем: фоном перезаливаются только
+    полосы вокруг вставленного контента, без выделения нового буфера.
+    Непрозрачное изображение, которое уже занимает все видео, возвращается
+    само, без копирования в холст.
+    
     Args:
-        image (PIL.Image): Исходное изображение
+        image (np.ndarray): Исходное изображение в формате BGR или BGRA
         scale (int): Коэффициент масштабирования
         width (int): Ширина получаемого видео
         height (int): Высота получаемого видео
-        background_color (tuple): Цвет фона
+        background_color (tuple): Цвет фона в формате BGR
+        canvas (np.ndarray): Переиспользуемый холст BGR размером height x width (необязательно)
         
     Returns:
-        tuple: (PIL.Image, (x, y, new_width, new_height)) — изображение и позиция/размер вставленного контента
+        tuple: (np.ndarray, (x, y, new_width, new_height)) — кадр BGR и позиция/размер вставленного контента
     """
+    img_height, img_width = image.shape[:2]
+    # Геометрия кэшируется в compute_frame_layout и считается один раз на все кадры дня
+    layout = compute_frame_layout(img_width, img_height, scale, width, height)
+    x, y, new_width, new_height = layout.placement
+    interpolation = layout.interpolation
+    
+    # Если кадр больше видео, уменьшаем его целиком и обрезаем по центру
+    if layout.crop is not None:
+        image = cv2.resize(image, layout.resized_size, interpolation=interpolation)
+        crop_x, crop_y = layout.crop
+        image = image[crop_y:crop_y + new_height, crop_x:crop_x + new_width]
+    
+    opaque = image.shape[2] == 3
+    if opaque and image.shape[:2] == (new_height, new_width):
+        # Кадр занимает все видео: фон не нужен, изображение и есть готовый кадр
+        if (new_width, new_height) == (width, height):
+            return image, layout.placement
+        
+        # Без прозрачности и ресайза фон и копирование делаются одним вызовом OpenCV
+        canvas = cv2.copyMakeBorder(
+            image, y, height - new_height - y, x, width - new_width - x,
+            cv2.BORDER_CONSTANT, dst=canvas, value=background_color,
+        )
+        return canvas, layout.placement
+    
+    if canvas is None:
+        # Создаем холст, залитый цветом фона
+        canvas = np.full((height, width, 3), background_color, dtype=np.uint8)
+    else:
+        # Перезаливаем фоном только то, что не будет перекрыто изображением
+        fill_background(canvas[:y], background_color)
+        fill_background(canvas[y + new_height:], background_color)
+        fill_background(canvas[y:y + new_height, :x], background_color)
+        fill_background(canvas[y:y + new_height, x + new_width:], background_color)
+    roi = canvas[y:y + new_height, x:x + new_width]
+    
+    if opaque:
+        # Результат ресайза пишется сразу в свою область холста, без промежуточного кадра
+        cv2.resize(image, (new_width, new_height), dst=roi, interpolation=interpolation)
+        return canvas, layout.placement
+    
+    # Без сглаживающего ресайза альфа остается 0/255, если была такой в дампе:
+    # тогда вместо смешивания достаточно скопировать закрашенные пиксели поверх фона
+    binary_alpha = (
+        (interpolation == cv2.INTER_NEAREST or image.shape[:2] == (new_height, new_width))
+        and has_binary_alpha(image)
+    )
+    if binary_alpha:
+        fill_background(roi, background_color)
+    
+    # Ресайз и смешивание с фоном идут полосами прямо в холст,
+    # и временные массивы BGRA никогда не достигают размера кадра
+    for strip_y, strip in resize_in_strips(image, new_width, new_height, interpolation):
+        out = roi[strip_y:strip_y + strip.shape[0]]
+        if binary_alpha:
+            paste_opaque_pixels(strip, out)
+        else:
+            blend_over_background(strip, background_color, out)
+    
+    return canvas, layout.placement
+
+# Цифры шрифта HERSHEY одинаковой ширины, поэтому разметка метки зависит только от ее формата
+DIGITS_TO_ZERO = str.maketrans('0123456789', '0000000000')
 
-    # Если исходный размер уже совпадает с целевым и размер не отличен от установленного, возвращаем без пересэмплинга
-    img_width, img_height = image.size
+@lru_cache(maxsize=16)
+def get_timestamp_layout(text_template, frame_width, frame_height, font_size):
+    """
+    Вычисляет масштаб шрифта и положение временной метки на кадре.
+    
+    Результат кэшируется: для всех меток одного формата (например,
+    YYYY-MM-DD HH:MM:SS) и одного размера кадра он одинаков. Если метка
+    высотой font_size не помещается по ширине (маленькие дампы, SCALE < 1),
+    шрифт уменьшается до ширины кадра за вычетом отступов.
+    
+    Args:
+        text_template (str): Метка, в которой все цифры заменены на 0
+        frame_width (int): Ширина кадра
+        frame_height (int): Высота кадра
+        font_size (int): Высота шрифта в пикселях
+        
+    Returns:
+        tuple: (font_scale, (x, y) начала текста)
+    """
+    font_scale = cv2.getFontScaleFromHeight(TIMESTAMP_FONT, font_size, TIMESTAMP_THICKNESS)
+    
+    # Ширину меряем с учетом обводки, она выступает за края букв
+    margin_x = 16
+    max_width = frame_width - 2 * margin_x
+    (text_width, _), _ = cv2.getTextSize(text_template, TIMESTAMP_FONT, font_scale, TIMESTAMP_STROKE_THICKNESS)
+    while text_width > max_width and font_scale > 0.1:
+        # Ширина почти пропорциональна масштабу; 0.95 гарантирует сходимость при округлениях
+        font_scale *= min(max_width / text_width, 0.95)
+        (text_width, _), _ = cv2.getTextSize(text_template, TIMESTAMP_FONT, font_scale, TIMESTAMP_STROKE_THICKNESS)
+    
+    # Вычислим размер текста и позицию по центру снизу
+    (text_width, text_height), baseline = cv2.getTextSize(
+        text_template, TIMESTAMP_FONT, font_scale, TIMESTAMP_THICKNESS
+    )
+    margin_y = 12
+    x = (frame_width - text_width) // 2
+    y = frame_height - baseline - margin_y - 8
+    
+    return font_scale, (x, y)
 
-    if img_width == width and img_height == height:
-        if image.mode == 'RGBA':
-            composed = Image.new('RGB', (width, height), background_color)
-            composed.paste(image, (0, 0), image)
-            return composed, (0, 0, width, height)
-        return image.convert('RGB'), (0, 0, width, height)
+def add_timestamp_overlay(image, timestamp, font_size=TIMESTAMP_FONT_SIZE, layout=None):
+    """
+    Добавляет временную метку на изображение (рисует прямо на кадре).
+    
+    Args:
+        image (np.ndarray): Кадр в формате BGR
+        timestamp (str): Временная метка (шрифт OpenCV поддерживает только ASCII)
+        font_size (int): Высота шрифта в пикселях
+        layout (tuple): Заранее вычисленный результат get_timestamp_layout (необязательно)
+        
+    Returns:
+        np.ndarray: Тот же кадр с временной меткой
+    """
+    if layout is None:
+        frame_height, frame_width = image.shape[:2]
+        layout = get_timestamp_layout(timestamp.translate(DIGITS_TO_ZERO), frame_width, frame_height, font_size)
+    font_scale, origin = layout
     
-    if scale != 1:
-        # Новые размеры с сохранением пропорций
-        new_width = int(img_width * scale)
-        new_height = int(img_height * scale)
+    # Белый текст с черной обводкой для читаемости: сначала толстый черный, поверх тонкий белый
+    cv2.putText(
+        image, timestamp, origin, TIMESTAMP_FONT, font_scale, (0, 0, 0), TIMESTAMP_STROKE_THICKNESS, cv2.LINE_AA
+    )
+    cv2.putText(
+        image, timestamp, origin, TIMESTAMP_FONT, font_scale, (255, 255, 255), TIMESTAMP_THICKNESS, cv2.LINE_AA
+    )
+    return image
 
-        # Выбираем метод ресайза: для кратного масштабирования используем NEAREST (пиксель-перфект)
-        down_int = (img_width % width == 0) and (img_height % height == 0)
-        up_int = (width % img_width == 0) and (height % img_height == 0)
-        resample = Image.NEAREST if (down_int or up_int) else Image.Resampling.LANCZOS
+def format_timestamp(image_path):
+    """
+    Извлекает временную метку из имени файла.
+    
+    Args:
+        image_path (str): Путь к изображению формата merged_tiles_YYYYMMDD_HHMMSS.png
         
-        # Изменяем размер изображения
-        resized_image = image.resize((new_width, new_height), resample)
+    Returns:
+        str: Метка вида YYYY-MM-DD HH:MM:SS или None, если имя не по формату
+    """
+    match = MERGED_TILES_PATTERN.match(os.path.basename(image_path))
+    if not match:
+        return None
+    date_part, time_part = match.groups()
+    return f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]} {time_part[:2]}:{time_part[2:4]}:{time_part[4:6]}"
+
+def prepare_frame(image_path, index, canvas, video_width, video_height, background_color, timestamp_layout=None,
+                  resize_backend='cv2'):
+    """
+    Готовит один кадр видео: декодирование, вписывание в холст и временная метка.
     
-    # Создаем новое изображение с белым фоном
-    result = Image.new('RGB', (width, height), background_color)
+    Args:
+        image_path (str): Путь к изображению
+        index (int): Номер кадра
+        canvas (np.ndarray): Холст BGR, в котором собирается кадр
+        video_width (int): Ширина видео
+        video_height (int): Высота видео
+        background_color (tuple): Цвет фона в формате BGR
+        timestamp_layout (tuple): Разметка метки формата TIMESTAMP_TEMPLATE (необязательно)
+        resize_backend (str): Библиотека для масштабирования: 'cv2', 'vips' или 'cykooz'
+        
+    Returns:
+        np.ndarray: Готовый кадр BGR или None, если изображение не удалось прочитать
+    """
+    image, scale = read_frame_scaled(image_path, video_width, video_height, resize_backend)
+    if image is None:
+        return None
     
-    # Вычисляем позицию для центрирования
-    x = (width - new_width) // 2
-    y = (height - new_height) // 2
+    frame, _ = resize_image_to_fit(
+        image, scale, video_width, video_height, background_color, canvas=canvas
+    )
     
-    # Вставляем изображение по центру
-    if resized_image.mode == 'RGBA':
-        result.paste(resized_image, (x, y), resized_image)
+    timestamp = format_timestamp(image_path)
+    if timestamp is None:
+        add_timestamp_overlay(frame, f"#{index + 1}")
     else:
-        result.paste(resized_image, (x, y))
+        add_timestamp_overlay(frame, timestamp, layout=timestamp_layout)
+    return frame
+
+def prepare_frames(images, video_width, video_height, background_color, workers=FRAME_WORKERS, output=None,
+                   resize_backend='cv2'):
+    """
+    Готовит кадры параллельно в пуле потоков, отдавая их строго по порядку.
     
-    return result, (x, y, new_width, new_height)
+    OpenCV отпускает GIL при декодировании, ресайзе и смешивании, поэтому
+    потоки действительно загружают все ядра, а кадры не копируются между
+    процессами. У каждого кадра «в полете» свой холст; холст возвращается
+    в работу, когда вызывающий код забрал следующий кадр, то есть
+    предыдущий уже записан.
+    
+    Args:
+        images (list): Список путей к изображениям
+        video_width (int): Ширина видео
+        video_height (int): Высота видео
+        background_color (tuple): Цвет фона в формате BGR
+        workers (int): Количество потоков
+        output (np.ndarray): Массив (N, H, W, 3), в i-й элемент которого собирается i-й кадр
+            (необязательно; по умолчанию холсты переиспользуются по кругу)
+        resize_backend (str): Библиотека для масштабирования: 'cv2', 'vips' или 'cykooz'
+        
+    Yields:
+        tuple: (путь к изображению, Future с результатом prepare_frame)
+    """
+    free_canvases = []
+    if output is None:
+        free_canvases = [
+            np.full((video_height, video_width, 3), background_color, dtype=np.uint8)
+            for _ in range(workers + 1)
+        ]
+    # Метки всех кадров одного формата, поэтому разметка текста считается один раз
+    timestamp_layout = get_timestamp_layout(TIMESTAMP_TEMPLATE, video_width, video_height, TIMESTAMP_FONT_SIZE)
+    
+    pending = deque()
+    remaining = iter(enumerate(images))
+    
+    # Параллелизм уже идет по кадрам, и внутренние потоки OpenCV и libvips
+    # дали бы workers x cpu_count потоков на cpu_count ядер
+    opencv_threads = cv2.getNumThreads()
+    vips_threads = pyvips.concurrency_get() if pyvips is not None else None
+    if workers > 1:
+        cv2.setNumThreads(1)
+        if pyvips is not None:
+            pyvips.concurrency_set(1)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def submit_next():
+                item = next(remaining, None)
+                if item is None:
+                    return
+                index, image_path = item
+                canvas = free_canvases.pop() if output is None else output[index]
+                future = executor.submit(
+                    prepare_frame, image_path, index, canvas,
+                    video_width, video_height, background_color, timestamp_layout, resize_backend,
+                )
+                pending.append((image_path, future, canvas))
+            
+            for _ in range(workers):
+                submit_next()
+            
+            while pending:
+                image_path, future, canvas = pending.popleft()
+                submit_next()
+                yield image_path, future
+                if output is None:
+                    free_canvases.append(canvas)
+    finally:
+        cv2.setNumThreads(opencv_threads)
+        if pyvips is not None:
+            pyvips.concurrency_set(vips_threads)
 
-def add_timestamp_overlay(image, timestamp, font_size=36):
+def frame_cache_key(images, video_width, video_height, resize_backend='cv2'):
     """
-    Добавляет временную метку на изображение.
+    Вычисляет ключ кэша кадров по списку дампов и всем настройкам, влияющим на картинку.
     
     Args:
-        image (PIL.Image): Изображение
-        timestamp (str): Временная метка
-        font_size (int): Размер шрифта
+        images (list): Список путей к изображениям
+        video_width (int): Ширина видео
+        video_height (int): Высота видео
+        resize_backend (str): Библиотека для масштабирования (разные дают немного разные пиксели)
         
     Returns:
-        PIL.Image: Изображение с временной меткой
+        str: Шестнадцатеричный SHA-1
     """
-    # Подготовим RGBA для полупрозрачности
-    base = image.convert('RGBA')
-    overlay = Image.new('RGBA', base.size, (255, 255, 255, 0))
-    draw = ImageDraw.Draw(overlay)
+    digest = hashlib.sha1()
+    settings = (
+        FRAME_CACHE_VERSION, video_width, video_height, SCALE, tuple(BACKGROUND_COLOR),
+        TIMESTAMP_FONT_SIZE, TIMESTAMP_THICKNESS, TIMESTAMP_STROKE_THICKNESS, resize_backend,
+    )
+    digest.update(repr(settings).encode())
+    for image_path in images:
+        stat = os.stat(image_path)
+        digest.update(f"{image_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
 
-    # Вычислим размер текста и позицию по центру снизу
-    # Начальная позиция для bbox (0,0), затем отцентрируем вручную
-    text_bbox = draw.textbbox((0, 0), timestamp)
-    text_width = text_bbox[2] - text_bbox[0]
-    text_height = text_bbox[3] - text_bbox[1]
-    margin_x = 16
-    margin_y = 12
-    x = (image.width - text_width) // 2
-    y = image.height - text_height - margin_y - 8
+def remove_stale_frame_caches(cache_dir, keep_path):
+    """
+    Удаляет из папки кэша все кэши кадров, кроме только что записанного.
+    
+    Каждый новый день или изменение настроек дает новый файл размером
+    N x H x W x 3 байт, поэтому хранится только последний. Файлы .part
+    не трогаются: они могут принадлежать параллельному запуску.
+    
+    Args:
+        cache_dir (str): Папка для кэша кадров
+        keep_path (str): Путь к актуальному кэшу
+    """
+    keep_name = os.path.basename(keep_path)
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            # frames_<sha>.npy и frames_<sha>.npy.valid.npy
+            if entry.name.startswith('frames_') and entry.name.endswith('.npy') and not entry.name.startswith(keep_name):
+                try:
+                    os.remove(entry.path)
+                except OSError as e:
+                    logger.warning(f"Не удалось удалить старый кэш кадров {entry.path}: {e}")
 
-    # Полупрозрачный (слегка) текст со stroke для читаемости
-    draw.text((x, y), timestamp, fill=(255, 255, 255, 230), stroke_width=2, stroke_fill=(0, 0, 0, 160))
+def iter_frames(images, video_width, video_height, background_color, cache_dir=None, resize_backend='cv2'):
+    """
+    Отдает готовые кадры по порядку, при необходимости используя кэш на диске.
+    
+    С cache_dir кадры складываются в один np.memmap формы (N, H, W, 3): при
+    первом запуске он заполняется по ходу кодирования, а при повторном
+    (перегенерация, отладка) кадры просто последовательно читаются из него
+    без декодирования PNG.
+    
+    Args:
+        images (list): Список путей к изображениям
+        video_width (int): Ширина видео
+        video_height (int): Высота видео
+        background_color (tuple): Цвет фона в формате BGR
+        cache_dir (str): Папка для кэша кадров (необязательно)
+        resize_backend (str): Библиотека для масштабирования: 'cv2', 'vips' или 'cykooz'
+        
+    Yields:
+        tuple: (путь к изображению, кадр BGR или None, если его не удалось подготовить)
+    """
+    frames = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_path = os.path.join(cache_dir, f"frames_{frame_cache_key(images, video_width, video_height, resize_backend)}.npy")
+        valid_path = cache_path + ".valid.npy"
+        
+        if os.path.exists(cache_path) and os.path.exists(valid_path):
+            logger.info(f"Использую кэш кадров {cache_path}")
+            frames = np.load(cache_path, mmap_mode='r')
+            valid = np.load(valid_path)
+            for image_path, frame, ok in zip(images, frames, valid):
+                yield image_path, frame if ok else None
+            return
+        
+        # Пишем во временный файл, чтобы прерванный запуск не оставил битый кэш
+        partial_path = cache_path + ".part"
+        frames = np.lib.format.open_memmap(
+            partial_path, mode='w+', dtype=np.uint8, shape=(len(images), video_height, video_width, 3)
+        )
+        valid = np.zeros(len(images), dtype=bool)
+    
+    prepared = prepare_frames(
+        images, video_width, video_height, background_color, output=frames, resize_backend=resize_backend
+    )
+    finished = False
+    try:
+        for i, (image_path, future) in enumerate(prepared):
+            try:
+                frame = future.result()
+            except Exception as e:
+                logger.error(f"Ошибка при обработке изображения {image_path}: {e}")
+                frame = None
+            else:
+                if frame is None:
+                    logger.error(f"Не удалось прочитать изображение {image_path}")
+            
+            if frames is not None and frame is not None:
+                valid[i] = True
+                if not np.may_share_memory(frame, frames[i]):
+                    frames[i] = frame
+            yield image_path, frame
+        finished = True
+    finally:
+        if frames is not None and not finished:
+            # Кодирование прервалось: дожидаемся потоков, которые еще пишут в memmap,
+            # и удаляем недописанный кэш, который может занимать гигабайты
+            prepared.close()
+            del frames
+            os.remove(partial_path)
+    
+    if frames is not None:
+        frames.flush()
+        del frames
+        np.save(valid_path, valid)
+        os.replace(partial_path, cache_path)
+        remove_stale_frame_caches(cache_dir, cache_path)
 
-    # Композитим и возвращаем в RGB
-    composed = Image.alpha_composite(base, overlay).convert('RGB')
-    return composed
+def ffmpeg_codec_args(codec):
+    """
+    Собирает аргументы ffmpeg для выбранного кодека с настройками из config.py.
+    
+    Args:
+        codec (str): Кодек ffmpeg ("h264_nvenc" или программный, например "libx264")
+        
+    Returns:
+        list: Аргументы командной строки ffmpeg
+    """
+    if codec == "h264_nvenc":
+        return [
+            '-c:v', 'h264_nvenc', '-preset', FFMPEG_NVENC_PRESET, '-tune', 'hq',
+            '-rc', 'vbr', '-b:v', '0', '-cq', str(FFMPEG_CRF),
+        ]
+    return ['-c:v', codec, '-preset', FFMPEG_PRESET, '-crf', str(FFMPEG_CRF), '-threads', '0']
 
-def create_timelapse_video(images, output_path, video_width, video_height, fps=None):
+class FFmpegVideoWriter:
+    """
+    Кодирует кадры через внешний ffmpeg, принимая сырые BGR-кадры в stdin.
+    
+    Повторяет интерфейс cv2.VideoWriter (write/release), поэтому вызывающему
+    коду не важно, какой вариант используется.
+    """
+    
+    def __init__(self, output_path, fps, width, height, codec="libx264"):
+        cmd = [
+            # stderr не перехватывается: ошибки ffmpeg сразу идут в лог запуска
+            'ffmpeg', '-y', '-hide_banner', '-nostats', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}', '-r', str(fps),
+            '-i', '-',
+            # yuv420p требует четных размеров кадра; добавленная полоса — цвета фона (RGB)
+            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2:color=0x{:02X}{:02X}{:02X}'.format(*BACKGROUND_COLOR),
+            *ffmpeg_codec_args(codec),
+            '-pix_fmt', 'yuv420p', '-movflags', '+faststart',
+            output_path,
+        ]
+        self.codec = codec
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    
+    def write(self, frame):
+        # Передаем буфер массива напрямую, без копии в bytes на каждый кадр
+        if not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame)
+        self.process.stdin.write(frame.data)
+    
+    def release(self):
+        self.process.stdin.close()
+        returncode = self.process.wait()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg завершился с кодом {returncode}")
+
+class CudaVideoWriter:
+    """
+    Кодирует кадры через cv2.cudacodec (NVENC), загружая их в видеопамять.
+    
+    Доступен только в сборках OpenCV с CUDA и включается USE_CUDACODEC;
+    интерфейс тот же, что у cv2.VideoWriter (write/release). Пресет и качество
+    берутся из тех же настроек, что и для h264_nvenc в ffmpeg.
+    """
+    
+    def __init__(self, output_path, fps, width, height):
+        # То же, что "-preset p4 -tune hq -rc vbr -b:v 0 -cq CRF" для ffmpeg
+        params = cv2.cudacodec.EncoderParams()
+        params.nvPreset = getattr(cv2.cudacodec, f"ENC_PRESET_{FFMPEG_NVENC_PRESET.upper()}")
+        params.tuningInfo = cv2.cudacodec.ENC_TUNING_INFO_HIGH_QUALITY
+        params.rateControlMode = cv2.cudacodec.ENC_PARAMS_RC_VBR
+        params.averageBitRate = 0
+        params.targetQuality = FFMPEG_CRF
+        
+        self.writer = cv2.cudacodec.createVideoWriter(
+            output_path, (width, height), cv2.cudacodec.Codec_H264, fps, cv2.cudacodec.ColorFormat_BGR, params,
+        )
+        # Один буфер в видеопамяти на все кадры
+        self.gpu_frame = cv2.cuda_GpuMat(height, width, cv2.CV_8UC3)
+    
+    def write(self, frame):
+        self.gpu_frame.upload(frame)
+        self.writer.write(self.gpu_frame)
+    
+    def release(self):
+        self.writer.release()
+
+def cudacodec_available(width, height):
+    """
+    Проверяет, можно ли кодировать через cv2.cudacodec.
+    
+    Args:
+        width (int): Ширина видео
+        height (int): Высота видео
+        
+    Returns:
+        bool: True, если OpenCV собран с cudacodec и видит CUDA-устройство
+    """
+    if not hasattr(cv2, 'cudacodec') or not hasattr(cv2, 'cuda'):
+        return False
+    # NVENC не принимает нечетные размеры, а дополнять кадр здесь некому
+    if width % 2 or height % 2:
+        return False
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except cv2.error:
+        return False
+
+@lru_cache(maxsize=4)
+def nvenc_available(width, height):
+    """
+    Проверяет, что ffmpeg действительно может кодировать через NVENC.
+    
+    Наличия nvidia-smi недостаточно: сборка ffmpeg может быть без NVENC
+    или не знать пресетов p1–p7, драйвер — не поддерживать нужную версию API,
+    а кадр — превышать предел h264_nvenc (4096x4096). Поэтому пробный кадр
+    кодируется в размере видео и с теми же аргументами, что и при записи.
+    
+    Args:
+        width (int): Ширина видео
+        height (int): Высота видео
+        
+    Returns:
+        bool: True, если h264_nvenc принял такие настройки
+    """
+    if not shutil.which('nvidia-smi'):
+        return False
+    # FFmpegVideoWriter дополняет кадр до четных размеров
+    probe = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f'color=black:s={width + width % 2}x{height + height % 2}', '-frames:v', '1',
+        *ffmpeg_codec_args("h264_nvenc"), '-pix_fmt', 'yuv420p', '-f', 'null', '-',
+    ]
+    try:
+        result = subprocess.run(probe, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+def open_video_writer(output_path, fps, width, height):
+    """
+    Открывает кодировщик видео: cv2.cudacodec, если он включен USE_CUDACODEC
+    и OpenCV собран с CUDA, иначе ffmpeg (NVENC, если он работает, иначе
+    libx264), а если ffmpeg не установлен — встроенный в OpenCV mp4v.
+    
+    Args:
+        output_path (str): Путь для сохранения видео
+        fps (int): Количество кадров в секунду
+        width (int): Ширина видео
+        height (int): Высота видео
+        
+    Returns:
+        CudaVideoWriter | FFmpegVideoWriter | cv2.VideoWriter: Объект с методами write(frame) и release()
+    """
+    if USE_CUDACODEC:
+        if not cudacodec_available(width, height):
+            logger.warning("cv2.cudacodec недоступен, используется ffmpeg")
+        else:
+            try:
+                video_writer = CudaVideoWriter(output_path, fps, width, height)
+            except (cv2.error, AttributeError) as e:
+                logger.warning(f"Не удалось открыть cv2.cudacodec, используется ffmpeg: {e}")
+            else:
+                logger.info("Кодирую видео через cv2.cudacodec (NVENC)")
+                return video_writer
+    
+    if shutil.which('ffmpeg'):
+        codec = "h264_nvenc" if nvenc_available(width, height) else "libx264"
+        logger.info(f"Кодирую видео через ffmpeg ({codec})")
+        return FFmpegVideoWriter(output_path, fps, width, height, codec)
+    
+    logger.warning("ffmpeg не найден, используется кодек mp4v из OpenCV")
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    video_writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    if not video_writer.isOpened():
+        raise RuntimeError(f"Не удалось открыть {output_path} для записи")
+    return video_writer
+
+def create_timelapse_video(images, output_path, video_width, video_height, fps=None, cache_dir=None,
+                           resize_backend=None):
     """
     Создает видео-таймлапс из списка изображений.
     
@@ -166,55 +1000,43 @@ def create_timelapse_video(images, output_path, video_width, video_height, fps=N
         video_width (int): Ширина видео
         video_height (int): Высота видео
         fps (int): Количество кадров в секунду (если None, используется FPS из config.py)
+        cache_dir (str): Папка для кэша готовых кадров (если None, кэш не используется)
+        resize_backend (str): Одно из RESIZE_BACKENDS (если None, используется RESIZE_BACKEND из config.py)
     """
     if fps is None:
         fps = FPS
+    if resize_backend is None:
+        resize_backend = RESIZE_BACKEND
     
     if not images:
         logger.error("Нет изображений для создания таймлапса")
         return False
     
     try:
+        resize_backend = resolve_resize_backend(resize_backend)
+        if SCALE != 1:
+            logger.info(f"Масштабирую кадры через {resize_backend}")
+        
         # Инициализируем видео writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        video_writer = cv2.VideoWriter(output_path, fourcc, fps, (video_width, video_height))
+        video_writer = open_video_writer(output_path, fps, video_width, video_height)
+        
+        # OpenCV работает в BGR, а цвет фона в config.py задан в RGB
+        background_bgr = tuple(reversed(BACKGROUND_COLOR))
         
         logger.info(f"Создаю видео с {len(images)} кадрами, FPS: {fps}")
         
-        for i, image_path in enumerate(images):
-            try:
-                # Загружаем изображение
-                pil_image = Image.open(image_path)
-                
-                # Извлекаем временную метку из имени файла
-                filename = os.path.basename(image_path)
-                # Формат: merged_tiles_YYYYMMDD_HHMMSS.png
-                parts = filename.split('_')
-                if len(parts) >= 3:
-                    date_part = parts[2]
-                    time_part = parts[3].split('.')[0]
-                    timestamp = f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]} {time_part[:2]}:{time_part[2:4]}:{time_part[4:6]}"
-                else:
-                    timestamp = f"Кадр {i+1}"
-                
-                # Изменяем размер и добавляем на белый фон
-                resized_image, placement = resize_image_to_fit(pil_image, SCALE, video_width, video_height, BACKGROUND_COLOR)
-                
-                # Добавляем временную метку
-                final_image = add_timestamp_overlay(resized_image, timestamp)
-                
-                # Конвертируем PIL в OpenCV формат
-                opencv_image = cv2.cvtColor(np.array(final_image), cv2.COLOR_RGB2BGR)
-                
-                # Записываем кадр в видео
-                video_writer.write(opencv_image)
-                
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Обработано {i + 1}/{len(images)} кадров")
-                    
-            except Exception as e:
-                logger.error(f"Ошибка при обработке изображения {image_path}: {e}")
+        frames = iter_frames(
+            images, video_width, video_height, background_bgr, cache_dir=cache_dir, resize_backend=resize_backend
+        )
+        for i, (image_path, frame) in enumerate(frames):
+            if frame is None:
                 continue
+            
+            # Записываем кадр в видео
+            video_writer.write(frame)
+            
+            if (i + 1) % 10 == 0:
+                logger.info(f"Обработано {i + 1}/{len(images)} кадров")
         
         # Закрываем video writer
         video_writer.release()
@@ -229,6 +1051,8 @@ def parse_args():
     parser = argparse.ArgumentParser(description="Создание видео-таймлапса из изображений за день")
     parser.add_argument("--date", dest="date_str", help="Дата в формате YYYYMMDD. По умолчанию — вчера")
     parser.add_argument("--fps", dest="fps", help="FPS. По умолчанию – та настройка, что в config.py")
+    parser.add_argument("--cache-dir", dest="cache_dir", help="Папка для кэша готовых кадров (np.memmap). По умолчанию кэш не используется")
+    parser.add_argument("--resize-backend", dest="resize_backend", choices=RESIZE_BACKENDS, help="Библиотека для масштабирования кадров. По умолчанию – та настройка, что в config.py")
     return parser.parse_args()
 
 def main():
@@ -262,9 +1086,9 @@ def main():
     # Создаем таймлапс
     
     if args.fps:
-        success = create_timelapse_video(images, output_path, video_width, video_height, int(args.fps))
+        success = create_timelapse_video(images, output_path, video_width, video_height, int(args.fps), args.cache_dir, args.resize_backend)
     else:
-        success = create_timelapse_video(images, output_path, video_width, video_height)
+        success = create_timelapse_video(images, output_path, video_width, video_height, cache_dir=args.cache_dir, resize_backend=args.resize_backend)
     
     
     if success: